@@ -1,4 +1,5 @@
 # backend/app.py
+import os
 import re
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -7,6 +8,9 @@ import pandas as pd
 import logging
 import traceback
 from ml_model import SpotifyMLAnalyzer
+from training import SpotifyModelTrainer
+from columnar_engine import ColumnarPlayStore
+import queries
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
@@ -19,8 +23,21 @@ handler.setFormatter(logging.Formatter(
 app.logger.addHandler(handler)
 app.logger.setLevel(logging.DEBUG)
 
+# Serve dashboard analytics from the in-memory columnar store instead of SQLite
+USE_COLUMNAR_ENGINE = os.environ.get('SPOTIFY_COLUMNAR_ENGINE', '0') == '1'
+columnar_store = ColumnarPlayStore(
+    'spotify.db',
+    refresh_interval=float(os.environ.get('SPOTIFY_COLUMNAR_REFRESH_SECONDS', 5))
+) if USE_COLUMNAR_ENGINE else None
+
 # Initialize ML system
 ml_analyzer = SpotifyMLAnalyzer()
+ml_trainer = SpotifyModelTrainer(
+    ml_analyzer,
+    n_folds=int(os.environ.get('SPOTIFY_TRAIN_FOLDS', 5)),
+    cpu_budget=int(os.environ.get('SPOTIFY_TRAIN_CPUS', 0)) or None,
+    memory_budget_mb=int(os.environ.get('SPOTIFY_TRAIN_MEMORY_MB', 0)) or None
+)
 
 def load_training_data():
     conn = sqlite3.connect('spotify.db')
@@ -48,15 +65,23 @@ try:
     if df.empty:
         raise RuntimeError("No valid training data available")
         
-    ml_analyzer.train_skip_predictor(df)
-    ml_analyzer.train_duration_predictor(df)
-    app.logger.info("ML models trained successfully")
+    # Cross-validation runs in the background so it never delays or blocks startup
+    report = ml_trainer.train(df, background_evaluation=True)
+    app.logger.info(f"ML models trained successfully: {report['stages']}")
     
 except Exception as e:
     app.logger.error(f"Model training failed: {str(e)}")
     traceback.print_exc()
     exit(1)
 
+# Load the columnar store up front so the first dashboard requests don't wait on it
+if columnar_store is not None:
+    try:
+        columnar_store.refresh()
+        app.logger.info(f"Columnar store loaded with {len(columnar_store)} plays")
+    except Exception as e:
+        app.logger.error(f"Columnar store load failed, retrying on first request: {str(e)}")
+
 # API Endpoints
 @app.route('/api/ml/predict-skip', methods=['POST'])
 def predict_skip():
@@ -115,47 +140,40 @@ def predict_session_duration():
         app.logger.error(f"Duration prediction error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/ml/training-report', methods=['GET'])
+def training_report():
+    if ml_trainer.report is None:
+        return jsonify({"error": "Training report not available"}), 503
+    return jsonify(ml_trainer.report)
+
 @app.route('/api/basic/total-plays', methods=['GET'])
 def total_plays():
+    if columnar_store is not None:
+        return jsonify(columnar_store.total_plays())
     conn = sqlite3.connect('spotify.db')
-    query = "SELECT COUNT(*) as total_plays FROM spotify_history"
-    result = pd.read_sql(query, conn).to_dict(orient='records')
+    result = pd.read_sql(queries.TOTAL_PLAYS, conn).to_dict(orient='records')
     conn.close()
     return jsonify(result)
 
 @app.route('/api/basic/most-played-tracks', methods=['GET'])
 def most_played_tracks():
+    if columnar_store is not None:
+        return jsonify(columnar_store.most_played_tracks())
     conn = sqlite3.connect('spotify.db')
-    query = """
-        SELECT "Track Name", Artist, COUNT(*) as play_count
-        FROM spotify_history
-        GROUP BY "Track Name", Artist
-        ORDER BY play_count DESC
-        LIMIT 10;
-    """
-    result = pd.read_sql(query, conn).to_dict(orient='records')
+    result = pd.read_sql(queries.MOST_PLAYED_TRACKS, conn).to_dict(orient='records')
     conn.close()
     return jsonify(result)
 
 @app.route('/api/basic/artist-playtime', methods=['GET'])
 def artist_playtime():
+    if columnar_store is not None:
+        try:
+            return jsonify(columnar_store.artist_playtime())
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
     conn = sqlite3.connect('spotify.db')
-    query = """
-        SELECT 
-            Artist,
-            COUNT(*) AS Total_Plays,
-            ROUND(SUM(
-                CAST(substr("Duration (MM:SS)", 1, instr("Duration (MM:SS)", ':') - 1) AS INTEGER) * 60 + 
-                CAST(substr("Duration (MM:SS)", instr("Duration (MM:SS)", ':') + 1) AS INTEGER)
-            ) / 3600.0, 2) as Total_Hours_Played
-        FROM spotify_history
-        WHERE Artist IS NOT NULL
-        GROUP BY Artist
-        ORDER BY Total_Hours_Played DESC
-        limit 10;
-    """
     try:
-        result = pd.read_sql(query, conn).to_dict(orient='records')
+        result = pd.read_sql(queries.ARTIST_PLAYTIME, conn).to_dict(orient='records')
         conn.close()
         return jsonify(result)
     except Exception as e:
@@ -167,21 +185,11 @@ def artist_playtime():
 # ---------------------------
 @app.route('/api/visualization/activity-stackedbarchart', methods=['GET'])
 def activity_heatmap():
+    if columnar_store is not None:
+        return jsonify(columnar_store.activity_by_hour())
     conn = sqlite3.connect('spotify.db')
-    query = """
-        SELECT 
-            strftime('%H', Timestamp) AS hour,
-            strftime('%w', Timestamp) AS day_of_week,
-            COUNT(*) AS plays
-        FROM spotify_history
-        GROUP BY hour, day_of_week
-        ORDER BY day_of_week, hour;
-    """
-    result = pd.read_sql(query, conn)
+    result = queries.monday_first(pd.read_sql(queries.ACTIVITY_BY_HOUR, conn))
     conn.close()
-
-    # Convert day_of_week (0-6, where 0=Sunday) to (0-6, where 0=Monday)
-    result['day_of_week'] = (result['day_of_week'].astype(int) - 1) % 7
     return jsonify(result.to_dict(orient='records'))
 
 # ---------------------------
@@ -190,22 +198,12 @@ def activity_heatmap():
 @app.route('/api/intermediate/skip-analysis', methods=['GET'])
 def skip_analysis():
     try:
-        conn = sqlite3.connect('spotify.db')
-        query = """
-            SELECT 
-                Artist, 
-                "Track Name" AS track_name,
-                COUNT(*) AS total_plays,
-                SUM(CASE WHEN Skipped = 'Yes' THEN 1 ELSE 0 END) AS skips,
-                ROUND((SUM(CASE WHEN Skipped = 'Yes' THEN 1 ELSE 0 END) * 100.0) / COUNT(*), 1) AS skip_rate
-            FROM spotify_history
-            GROUP BY Artist, "Track Name"
-            HAVING total_plays >= 5  -- Only include tracks with at least 5 total plays
-            ORDER BY skips DESC
-            LIMIT 20;
-        """
-        result = pd.read_sql(query, conn).to_dict(orient='records')
-        conn.close()
+        if columnar_store is not None:
+            result = columnar_store.skip_analysis()
+        else:
+            conn = sqlite3.connect('spotify.db')
+            result = pd.read_sql(queries.SKIP_ANALYSIS, conn).to_dict(orient='records')
+            conn.close()
         return jsonify({
             'count': len(result),
             'data': result
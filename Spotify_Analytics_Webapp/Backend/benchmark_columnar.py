@@ -0,0 +1,111 @@
+# backend/benchmark_columnar.py
+# Times each dashboard query on SQLite (pd.read_sql) and on the columnar store,
+# and checks that both paths return the same rows.
+# Usage: python benchmark_columnar.py [spotify.db] [repeats]
+import sys
+import time
+import sqlite3
+import statistics
+from collections import Counter
+import pandas as pd
+import queries
+from columnar_engine import ColumnarPlayStore
+
+# (endpoint, SQL, post-processing applied by app.py, store method,
+#  ORDER BY column whose ties SQLite may order freely, columns identifying a group)
+BENCHMARKS = [
+    ('total-plays', queries.TOTAL_PLAYS, None, 'total_plays', None, None),
+    ('most-played-tracks', queries.MOST_PLAYED_TRACKS, None, 'most_played_tracks',
+     'play_count', ('Track Name', 'Artist')),
+    ('artist-playtime', queries.ARTIST_PLAYTIME, None, 'artist_playtime',
+     'Total_Hours_Played', ('Artist',)),
+    ('activity-stackedbarchart', queries.ACTIVITY_BY_HOUR, queries.monday_first,
+     'activity_by_hour', None, None),
+    ('skip-analysis', queries.SKIP_ANALYSIS, None, 'skip_analysis',
+     'skips', ('Artist', 'track_name')),
+]
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def sqlite_query(db_path, query, postprocess=None):
+    conn = sqlite3.connect(db_path)
+    try:
+        result = pd.read_sql(query, conn)
+    finally:
+        conn.close()
+
+    if postprocess is not None:
+        result = postprocess(result)
+    # NULL aggregates come back as NaN; the columnar store returns None
+    return result.astype(object).where(result.notna(), None).to_dict(orient='records')
+
+
+def same_rows(expected, actual, order_by, key):
+    """True if the rows match, allowing any order among tied ORDER BY values.
+
+    Rows tied with the last (LIMIT boundary) value may also differ, since
+    SQLite is free to pick any of them, but a group returned by both paths
+    must have identical values.
+    """
+    if expected == actual:
+        return True
+    if not order_by or len(expected) != len(actual):
+        return False
+    if [row[order_by] for row in expected] != [row[order_by] for row in actual]:
+        return False
+
+    boundary = expected[-1][order_by]
+    groups = Counter(), Counter()
+    for rows, group in zip((expected, actual), groups):
+        group.update(
+            tuple(sorted(row.items())) for row in rows if row[order_by] != boundary
+        )
+    if groups[0] != groups[1]:
+        return False
+
+    expected_by_key = {tuple(row[col] for col in key): row for row in expected}
+    return all(
+        expected_by_key.get(tuple(row[col] for col in key), row) == row
+        for row in actual
+    )
+
+
+def main(db_path='spotify.db', repeats=20):
+    started = time.perf_counter()
+    store = ColumnarPlayStore(db_path).refresh()
+    print(f"Loaded {len(store)} plays into columnar store in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print(f"{'query':<28}{'sqlite ms':>12}{'columnar ms':>14}{'speedup':>10}{'rows':>10}")
+    mismatches = []
+    for name, query, postprocess, method, order_by, key in BENCHMARKS:
+        matches = same_rows(
+            sqlite_query(db_path, query, postprocess), getattr(store, method)(),
+            order_by, key
+        )
+        if not matches:
+            mismatches.append(name)
+        sqlite_ms = median_ms(lambda: sqlite_query(db_path, query, postprocess), repeats)
+        columnar_ms = median_ms(getattr(store, method), repeats)
+        print(f"{name:<28}{sqlite_ms:>12.2f}{columnar_ms:>14.2f}"
+              f"{sqlite_ms / max(columnar_ms, 1e-9):>9.1f}x"
+              f"{'match' if matches else 'MISMATCH':>10}")
+
+    if mismatches:
+        print(f"Columnar results differ from SQLite for: {', '.join(mismatches)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(
+        sys.argv[1] if len(sys.argv) > 1 else 'spotify.db',
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    ))
@@ -0,0 +1,295 @@
+# backend/columnar_engine.py
+import time
+import threading
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HISTORY_QUERY = """
+    SELECT rowid AS row_id, Timestamp, Artist, "Track Name" AS Track_Name,
+           "Duration (MM:SS)" AS Duration, Skipped
+    FROM spotify_history
+    WHERE rowid > ?
+    ORDER BY rowid
+"""
+
+ROW_QUERY = """
+    SELECT Timestamp, Artist, "Track Name", "Duration (MM:SS)", Skipped
+    FROM spotify_history
+    WHERE rowid = ?
+"""
+
+# Hour x SQLite weekday (0=Sunday) cells of the activity chart
+ACTIVITY_CELLS = 24 * 7
+
+
+def group_count(codes, n_groups):
+    return np.bincount(codes, minlength=n_groups)
+
+
+def group_sum(codes, weights, n_groups):
+    return np.bincount(codes, weights=weights, minlength=n_groups)
+
+
+def sqlite_round(values, decimals):
+    """Round halves away from zero like SQLite's ROUND (values are non-negative)."""
+    scale = 10 ** decimals
+    return np.floor(np.asarray(values, dtype=np.float64) * scale + 0.5) / scale
+
+
+def sqlite_duration_seconds(durations):
+    """Seconds for each "MM:SS" duration, parsed like queries.ARTIST_PLAYTIME.
+
+    The SQL splits at the first ':' with substr/instr and CASTs each part to
+    INTEGER, which reads its leading integer or gives 0. Without a ':' the
+    whole value counts as seconds. NULL durations stay NaN.
+    """
+    text = durations.astype('string')
+    has_colon = text.str.contains(':', regex=False).fillna(False).astype(bool)
+    split = text.str.split(':', n=1)
+    minutes = split.str[0].where(has_colon, '')
+    seconds = split.str[1].where(has_colon, text)
+    return _sqlite_integer(minutes) * 60 + _sqlite_integer(seconds)
+
+
+def _sqlite_integer(text):
+    # CAST(text AS INTEGER): optional whitespace and sign, then digits, else 0
+    value = text.str.extract(r'^\s*([+-]?\d+)', expand=False).astype('float64')
+    return value.fillna(0).where(text.notna())
+
+
+def top_k(scores, k, candidates=None):
+    """Indices of the k largest scores, best first; ties go to the lower code."""
+    if candidates is None:
+        candidates = np.arange(len(scores))
+    if k < len(candidates):
+        # Keep every entry tied with the k-th score so the cut is deterministic
+        cut = len(candidates) - k
+        kth_score = np.partition(scores[candidates], cut)[cut]
+        candidates = candidates[scores[candidates] >= kth_score]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+class DictionaryColumn:
+    """Categorical column stored as dense integer codes plus a value table.
+
+    Columns are never modified in place; extended() returns a new column so
+    readers holding the old one keep a consistent view.
+    """
+
+    def __init__(self, codes=None, values=None, index=None):
+        self.codes = np.empty(0, dtype=np.int32) if codes is None else codes
+        self.values = [] if values is None else values
+        self._index = {} if index is None else index
+
+    def __len__(self):
+        return len(self.values)
+
+    def code_of(self, value):
+        return self._index.get(value, -1)
+
+    def extended(self, values):
+        index = dict(self._index)
+        new_codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in values),
+            dtype=np.int32, count=len(values)
+        )
+        return DictionaryColumn(
+            np.concatenate([self.codes, new_codes]), list(index), index
+        )
+
+
+class PlayColumns:
+    """One immutable version of the loaded history, up to last_rowid."""
+
+    def __init__(self):
+        self.last_rowid = 0
+        self.last_row = None
+        self.hour = np.empty(0, dtype=np.int8)
+        self.weekday = np.empty(0, dtype=np.int8)
+        self.skipped = np.empty(0, dtype=np.int8)
+        # NaN where the duration is NULL, as SUM must skip those
+        self.duration_seconds = np.empty(0, dtype=np.float64)
+        self.artist = DictionaryColumn()
+        self.track_artist = DictionaryColumn()
+
+    def __len__(self):
+        return len(self.hour)
+
+    def extended(self, df):
+        parsed_time = pd.to_datetime(
+            df['Timestamp'], errors='coerce', format='mixed'
+        ).dt.tz_localize(None)
+        valid_time = parsed_time.notna()
+        # Store SQLite's strftime('%w') numbering so ordering matches the SQL path
+        hour = parsed_time.dt.hour.where(valid_time, -1)
+        weekday = ((parsed_time.dt.dayofweek + 1) % 7).where(valid_time, -1)
+
+        duration_seconds = sqlite_duration_seconds(df['Duration'])
+
+        artist = df['Artist'].astype(object).where(df['Artist'].notna(), None)
+        track = df['Track_Name'].astype(object).where(df['Track_Name'].notna(), None)
+
+        columns = PlayColumns()
+        columns.hour = np.concatenate([self.hour, hour.to_numpy(dtype=np.int8)])
+        columns.weekday = np.concatenate([self.weekday, weekday.to_numpy(dtype=np.int8)])
+        columns.skipped = np.concatenate([
+            self.skipped, (df['Skipped'] == 'Yes').to_numpy(dtype=np.int8)
+        ])
+        columns.duration_seconds = np.concatenate([
+            self.duration_seconds, duration_seconds.to_numpy(dtype=np.float64)
+        ])
+        columns.artist = self.artist.extended(artist.tolist())
+        columns.track_artist = self.track_artist.extended(
+            list(zip(track.tolist(), artist.tolist()))
+        )
+        return columns
+
+
+class ColumnarPlayStore:
+    """In-memory columnar copy of spotify_history for the dashboard group-bys.
+
+    Each endpoint query is answered with bincount kernels over integer codes.
+    Queries check SQLite for changes at most once per refresh_interval, using
+    index lookups only: MAX(rowid) and the row at the last loaded rowid. New
+    rows are appended; a rebuilt table or a deleted or replaced newest row
+    triggers a full reload. Deletes and UPDATEs of older rows are not
+    detected. SQLite is read outside the lock and the finished columns are
+    swapped in, so queries never wait on I/O once the first load is done.
+    """
+
+    def __init__(self, db_path='spotify.db', refresh_interval=5.0):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._columns = PlayColumns()
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._columns)
+
+    def refresh(self):
+        with self._refresh_lock:
+            self._load()
+        return self
+
+    def _load(self):
+        columns = self._columns
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # One read snapshot for the change check and the new batch
+            conn.execute("BEGIN")
+            if columns.last_rowid and self._row_at(conn, columns.last_rowid) != columns.last_row:
+                logger.info("spotify_history changed at the loaded rowid, reloading columnar store")
+                columns = PlayColumns()
+            max_rowid = conn.execute(
+                "SELECT MAX(rowid) FROM spotify_history"
+            ).fetchone()[0] or 0
+            if max_rowid > columns.last_rowid:
+                batch = pd.read_sql(HISTORY_QUERY, conn, params=(columns.last_rowid,))
+                columns = columns.extended(batch)
+                columns.last_rowid = int(batch['row_id'].max())
+                columns.last_row = self._row_at(conn, columns.last_rowid)
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._columns = columns
+            self._checked_at = time.monotonic()
+
+    def _snapshot(self):
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.refresh_interval:
+            # Only the very first load makes queries wait; afterwards a query
+            # that finds a refresh in progress serves the current columns
+            if self._refresh_lock.acquire(blocking=checked_at is None):
+                try:
+                    if self._checked_at == checked_at:
+                        self._load()
+                finally:
+                    self._refresh_lock.release()
+        with self._lock:
+            return self._columns
+
+    @staticmethod
+    def _row_at(conn, rowid):
+        return conn.execute(ROW_QUERY, (rowid,)).fetchone()
+
+    def total_plays(self):
+        return [{'total_plays': len(self._snapshot())}]
+
+    def most_played_tracks(self, limit=10):
+        columns = self._snapshot()
+        column = columns.track_artist
+        plays = group_count(column.codes, len(column))
+        return [
+            {
+                'Track Name': column.values[code][0],
+                'Artist': column.values[code][1],
+                'play_count': int(plays[code])
+            }
+            for code in top_k(plays, limit)
+        ]
+
+    def artist_playtime(self, limit=10):
+        columns = self._snapshot()
+        column = columns.artist
+        timed = ~np.isnan(columns.duration_seconds)
+        plays = group_count(column.codes, len(column))
+        timed_plays = group_count(column.codes[timed], len(column))
+        hours = sqlite_round(
+            group_sum(
+                column.codes[timed], columns.duration_seconds[timed], len(column)
+            ) / 3600.0, 2
+        )
+        # SUM over only NULL durations is NULL, which ORDER BY ... DESC puts last
+        scores = np.where(timed_plays > 0, hours, -1.0)
+        candidates = np.arange(len(column))
+        candidates = candidates[candidates != column.code_of(None)]
+        return [
+            {
+                'Artist': column.values[code],
+                'Total_Plays': int(plays[code]),
+                'Total_Hours_Played': float(hours[code]) if timed_plays[code] else None
+            }
+            for code in top_k(scores, limit, candidates)
+        ]
+
+    def activity_by_hour(self):
+        columns = self._snapshot()
+        valid = columns.hour >= 0
+        cells = (
+            columns.weekday[valid].astype(np.int32) * 24 + columns.hour[valid]
+        )
+        plays = group_count(cells, ACTIVITY_CELLS)
+        # Same shape as the SQL path after its Sunday-first -> Monday-first shift
+        return [
+            {
+                'hour': f"{cell % 24:02d}",
+                'day_of_week': int((cell // 24 - 1) % 7),
+                'plays': int(plays[cell])
+            }
+            for cell in np.flatnonzero(plays)
+        ]
+
+    def skip_analysis(self, min_plays=5, limit=20):
+        columns = self._snapshot()
+        column = columns.track_artist
+        plays = group_count(column.codes, len(column))
+        skips = group_sum(column.codes, columns.skipped, len(column))
+        candidates = np.flatnonzero(plays >= min_plays)
+        return [
+            {
+                'Artist': column.values[code][1],
+                'track_name': column.values[code][0],
+                'total_plays': int(plays[code]),
+                'skips': int(skips[code]),
+                'skip_rate': float(sqlite_round(skips[code] * 100.0 / plays[code], 1))
+            }
+            for code in top_k(skips, limit, candidates)
+        ]
@@ -10,7 +10,8 @@ from sklearn.exceptions import NotFittedError
 logger = logging.getLogger(__name__)
 
 class SpotifyMLAnalyzer:
-    def __init__(self):
+    def __init__(self, n_jobs=-1):
+        self.n_jobs = n_jobs
         self.skip_scaler = StandardScaler()
         self.duration_scaler = StandardScaler()
         self.label_encoders = {}
@@ -102,29 +103,39 @@ class SpotifyMLAnalyzer:
 
     def train_skip_predictor(self, df):
         processed_df = self.preprocess_data(df, is_training=True)
-        self.skip_scaler.fit(processed_df[self.feature_cols['skip']])
-        X = self.skip_scaler.transform(processed_df[self.feature_cols['skip']])
-        y = processed_df['Skipped']
-        
-        self.skip_predictor = RandomForestClassifier(
+        return self.fit_skip_predictor(processed_df)
+
+    def train_duration_predictor(self, df):
+        processed_df = self.preprocess_data(df)
+        return self.fit_duration_predictor(processed_df)
+
+    def build_skip_estimator(self, n_jobs=None):
+        return RandomForestClassifier(
             n_estimators=100, 
             max_depth=10, 
+            random_state=42,
+            n_jobs=self.n_jobs if n_jobs is None else n_jobs
+        )
+
+    def build_duration_estimator(self):
+        return GradientBoostingRegressor(
+            n_estimators=100,
+            max_depth=5,
             random_state=42
         )
-        self.skip_predictor.fit(X, y)
-        return self
 
-    def train_duration_predictor(self, df):
-        processed_df = self.preprocess_data(df)
-        
+    def skip_training_set(self, processed_df):
+        return processed_df[self.feature_cols['skip']], processed_df['Skipped']
+
+    def duration_training_set(self, processed_df):
         # Session detection
         processed_df = processed_df.sort_values('parsed_time')
-        processed_df['session_id'] = (
+        session_id = (
             (processed_df['parsed_time'].diff() > pd.Timedelta(minutes=30))
             .cumsum()
         )
         
-        session_features = processed_df.groupby('session_id').agg({
+        session_features = processed_df.groupby(session_id).agg({
             'hour': 'first',
             'day_of_week': 'first',
             'month': 'first',
@@ -132,18 +143,27 @@ class SpotifyMLAnalyzer:
             'artist_popularity': 'mean',
             'track_popularity': 'mean',
             'duration_seconds': 'sum'
-        }).reset_index()
+        }).reset_index(drop=True)
 
-        self.duration_scaler.fit(session_features[self.feature_cols['duration']])
-        X = self.duration_scaler.transform(session_features[self.feature_cols['duration']])
-        y = session_features['duration_seconds']
-        
-        self.duration_predictor = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=5,
-            random_state=42
+        return (
+            session_features[self.feature_cols['duration']],
+            session_features['duration_seconds']
         )
-        self.duration_predictor.fit(X, y)
+
+    def fit_skip_predictor(self, processed_df, n_jobs=None):
+        X, y = self.skip_training_set(processed_df)
+        self.skip_scaler.fit(X)
+        
+        self.skip_predictor = self.build_skip_estimator(n_jobs)
+        self.skip_predictor.fit(self.skip_scaler.transform(X), y)
+        return self
+
+    def fit_duration_predictor(self, processed_df):
+        X, y = self.duration_training_set(processed_df)
+        self.duration_scaler.fit(X)
+        
+        self.duration_predictor = self.build_duration_estimator()
+        self.duration_predictor.fit(self.duration_scaler.transform(X), y)
         return self
 
     def predict_skip_probability(self, new_data):
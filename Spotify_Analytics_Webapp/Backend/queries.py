@@ -0,0 +1,57 @@
+# backend/queries.py
+# SQLite queries behind the dashboard endpoints, plus their shared post-processing
+
+TOTAL_PLAYS = "SELECT COUNT(*) as total_plays FROM spotify_history"
+
+MOST_PLAYED_TRACKS = """
+    SELECT "Track Name", Artist, COUNT(*) as play_count
+    FROM spotify_history
+    GROUP BY "Track Name", Artist
+    ORDER BY play_count DESC
+    LIMIT 10;
+"""
+
+ARTIST_PLAYTIME = """
+    SELECT
+        Artist,
+        COUNT(*) AS Total_Plays,
+        ROUND(SUM(
+            CAST(substr("Duration (MM:SS)", 1, instr("Duration (MM:SS)", ':') - 1) AS INTEGER) * 60 +
+            CAST(substr("Duration (MM:SS)", instr("Duration (MM:SS)", ':') + 1) AS INTEGER)
+        ) / 3600.0, 2) as Total_Hours_Played
+    FROM spotify_history
+    WHERE Artist IS NOT NULL
+    GROUP BY Artist
+    ORDER BY Total_Hours_Played DESC
+    limit 10;
+"""
+
+ACTIVITY_BY_HOUR = """
+    SELECT
+        strftime('%H', Timestamp) AS hour,
+        strftime('%w', Timestamp) AS day_of_week,
+        COUNT(*) AS plays
+    FROM spotify_history
+    GROUP BY hour, day_of_week
+    ORDER BY day_of_week, hour;
+"""
+
+SKIP_ANALYSIS = """
+    SELECT
+        Artist,
+        "Track Name" AS track_name,
+        COUNT(*) AS total_plays,
+        SUM(CASE WHEN Skipped = 'Yes' THEN 1 ELSE 0 END) AS skips,
+        ROUND((SUM(CASE WHEN Skipped = 'Yes' THEN 1 ELSE 0 END) * 100.0) / COUNT(*), 1) AS skip_rate
+    FROM spotify_history
+    GROUP BY Artist, "Track Name"
+    HAVING total_plays >= 5  -- Only include tracks with at least 5 total plays
+    ORDER BY skips DESC
+    LIMIT 20;
+"""
+
+
+def monday_first(activity):
+    """Convert ACTIVITY_BY_HOUR's day_of_week (0=Sunday) to 0=Monday."""
+    activity['day_of_week'] = (activity['day_of_week'].astype(int) - 1) % 7
+    return activity
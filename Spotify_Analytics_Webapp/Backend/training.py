@@ -0,0 +1,203 @@
+# backend/training.py
+import os
+import time
+import logging
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.model_selection import KFold, StratifiedKFold, cross_validate
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Rough per-fold footprint relative to the float64 feature matrix: the
+# training split, its scaled copy and the tree-building buffers.
+FOLD_MEMORY_FACTOR = 4
+
+
+class SpotifyModelTrainer:
+    def __init__(self, analyzer, n_folds=5, cpu_budget=None, memory_budget_mb=None):
+        self.analyzer = analyzer
+        self.n_folds = n_folds
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+        self.memory_budget_mb = memory_budget_mb
+        self.report = None
+        self._evaluation_thread = None
+
+    def fold_workers(self, X, cpu_budget, memory_budget_mb):
+        workers = min(cpu_budget, self.n_folds)
+        if memory_budget_mb:
+            fold_bytes = len(X) * X.shape[1] * 8 * FOLD_MEMORY_FACTOR
+            budget_bytes = memory_budget_mb * 1024 * 1024
+            workers = min(workers, max(1, budget_bytes // max(fold_bytes, 1)))
+        return int(workers)
+
+    def feature_importances(self, model, kind):
+        importances = zip(self.analyzer.feature_cols[kind], model.feature_importances_)
+        return {
+            col: round(float(score), 4)
+            for col, score in sorted(importances, key=lambda item: item[1], reverse=True)
+        }
+
+    def train(self, df, background_evaluation=False):
+        started = time.perf_counter()
+        stages = {}
+
+        stage_start = time.perf_counter()
+        processed_df = self.analyzer.preprocess_data(df, is_training=True)
+        if processed_df.empty:
+            raise RuntimeError("No rows left after preprocessing")
+        stages['preprocess'] = time.perf_counter() - stage_start
+
+        # The forest gets every core except the one the boosting fit occupies
+        stage_start = time.perf_counter()
+        forest_jobs = max(1, self.cpu_budget - 1)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            skip_fit = pool.submit(
+                self._timed, self.analyzer.fit_skip_predictor, processed_df, forest_jobs
+            )
+            duration_fit = pool.submit(
+                self._timed, self.analyzer.fit_duration_predictor, processed_df
+            )
+            skip_fit_seconds = skip_fit.result()
+            duration_fit_seconds = duration_fit.result()
+        stages['fit'] = time.perf_counter() - stage_start
+
+        self.report = {
+            'cpu_budget': self.cpu_budget,
+            'memory_budget_mb': self.memory_budget_mb,
+            'n_folds': self.n_folds,
+            'evaluation': 'pending',
+            'stages': {stage: round(seconds, 3) for stage, seconds in stages.items()},
+            'skip': {
+                'fit_seconds': round(skip_fit_seconds, 3),
+                'feature_importances': self.feature_importances(
+                    self.analyzer.skip_predictor, 'skip'
+                )
+            },
+            'duration': {
+                'fit_seconds': round(duration_fit_seconds, 3),
+                'feature_importances': self.feature_importances(
+                    self.analyzer.duration_predictor, 'duration'
+                )
+            }
+        }
+        logger.info(f"Models fitted in {time.perf_counter() - started:.2f}s")
+
+        if background_evaluation:
+            self._evaluation_thread = threading.Thread(
+                target=self.evaluate, args=(processed_df,),
+                name='model-evaluation', daemon=True
+            )
+            self._evaluation_thread.start()
+        else:
+            self.evaluate(processed_df)
+        return self.report
+
+    def evaluate(self, processed_df):
+        """Cross-validate both models and merge the scores into the report.
+
+        The fitted models stay in service whatever happens here; a failure is
+        logged and recorded in the report instead of being raised. The report
+        is replaced rather than mutated so readers never see it half-written.
+        """
+        # Both cross-validations run at once, so each gets half the budget
+        skip_cpus = max(1, (self.cpu_budget + 1) // 2)
+        duration_cpus = max(1, self.cpu_budget - skip_cpus)
+        memory_mb = self.memory_budget_mb / 2 if self.memory_budget_mb else None
+
+        self.report = {**self.report, 'evaluation': 'running'}
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                skip_eval = pool.submit(
+                    self.evaluate_skip_predictor, processed_df, skip_cpus, memory_mb
+                )
+                duration_eval = pool.submit(
+                    self.evaluate_duration_predictor, processed_df, duration_cpus, memory_mb
+                )
+                skip_report = skip_eval.result()
+                duration_report = duration_eval.result()
+        except Exception as e:
+            logger.error(f"Model evaluation failed: {str(e)}")
+            self.report = {**self.report, 'evaluation': 'failed', 'evaluation_error': str(e)}
+            return self.report
+
+        seconds = time.perf_counter() - started
+        self.report = {
+            **self.report,
+            'evaluation': 'done',
+            'stages': {**self.report['stages'], 'evaluate': round(seconds, 3)},
+            'skip': {**self.report['skip'], **skip_report},
+            'duration': {**self.report['duration'], **duration_report}
+        }
+        logger.info(
+            f"Evaluation finished in {seconds:.2f}s "
+            f"(skip accuracy: {skip_report.get('accuracy', {}).get('mean')}, "
+            f"duration RMSE: {duration_report.get('rmse', {}).get('mean')})"
+        )
+        return self.report
+
+    def evaluate_skip_predictor(self, processed_df, cpu_budget, memory_budget_mb=None):
+        X, y = self.analyzer.skip_training_set(processed_df)
+        n_splits = min(self.n_folds, int(y.value_counts().min()))
+        if n_splits < 2:
+            logger.warning("Not enough samples per class for skip cross-validation")
+            return {'samples': len(X)}
+
+        # Folds run in parallel, so each forest stays single-threaded
+        estimator = make_pipeline(
+            StandardScaler(), self.analyzer.build_skip_estimator(n_jobs=1)
+        )
+        cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        workers = self.fold_workers(X, cpu_budget, memory_budget_mb)
+        scores, seconds = self._cross_validate(estimator, X, y, cv, 'accuracy', workers)
+        return {
+            'samples': len(X),
+            'accuracy': self._summarize(scores),
+            'cv_seconds': round(seconds, 3)
+        }
+
+    def evaluate_duration_predictor(self, processed_df, cpu_budget, memory_budget_mb=None):
+        X, y = self.analyzer.duration_training_set(processed_df)
+        n_splits = min(self.n_folds, len(X))
+        if n_splits < 2:
+            logger.warning("Not enough sessions for duration cross-validation")
+            return {'samples': len(X)}
+
+        estimator = make_pipeline(
+            StandardScaler(), self.analyzer.build_duration_estimator()
+        )
+        cv = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+        workers = self.fold_workers(X, cpu_budget, memory_budget_mb)
+        scores, seconds = self._cross_validate(
+            estimator, X, y, cv, 'neg_root_mean_squared_error', workers
+        )
+        return {
+            'samples': len(X),
+            'rmse': self._summarize(-scores),
+            'cv_seconds': round(seconds, 3)
+        }
+
+    def _cross_validate(self, estimator, X, y, cv, scoring, workers):
+        logger.debug(f"Cross-validating {cv.get_n_splits()} folds on {workers} workers")
+        started = time.perf_counter()
+        result = cross_validate(
+            estimator, X.astype('float64'), y, cv=cv, scoring=scoring, n_jobs=workers
+        )
+        return result['test_score'], time.perf_counter() - started
+
+    @staticmethod
+    def _summarize(scores):
+        return {
+            'mean': round(float(np.mean(scores)), 4),
+            'std': round(float(np.std(scores)), 4),
+            'folds': [round(float(score), 4) for score in scores]
+        }
+
+    @staticmethod
+    def _timed(fn, *args):
+        started = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - started